@@ -8,6 +8,9 @@ from .oscilloscope import Oscilloscope
 # Common Keysight Oscilloscope SCPI commands
 from .keysight import Keysight
 
+# Value of a measurement made in a Keysight.batch() block
+from .keysight import MeasureHandle
+
 # Support of Keysight MXR-series oscilloscopes
 from .mxr import MXR
 
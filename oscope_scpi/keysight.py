@@ -41,11 +41,96 @@ except Exception:
     from oscilloscope import Oscilloscope
     
 from time import sleep
-from datetime import datetime
+from time import monotonic
+from types import MappingProxyType
 from sys import version_info
+from threading import Lock
+import pyvisa as visa
+from contextlib import contextmanager
+import asyncio
 import numpy as np
 import struct
 
+## End of the docstring of every measure*() method made by _measureMethod()
+_MEASURE_DOC_TAIL = """
+
+        If the returned value is >= self.OverRange, then no valid value
+        could be measured.
+
+        channel: channel, as string, to be measured - default channel
+        for future readings
+
+        wait - if None, use *OPC? to wait for any setting changes to complete before
+        querying measurement, otherwise number of seconds to wait
+
+        install - if True, adds measurement to the statistics display
+
+        If self._measCacheTTL is set above 0 and wait is None, a value
+        read less than that many seconds ago is returned again without
+        querying the oscilloscope. Call invalidateMeasCache() after
+        changing the signal or settings outside of this class.
+        """
+
+def _measureMethod(name, mode, para=None, doc='', newer=None):
+    """Return a Keysight method called name that reads and returns
+    measurement mode, with parameters para, using _measure()
+
+    newer - if not None, the (mode, para) to use instead with firmware
+            newer than _versionLegacy, or () if the measurement does
+            not exist there and self.OverRange is returned
+
+    '{chan}' in para is replaced by the string of the measured channel
+    for measurements which need the source in their parameters.
+
+    All of these methods share this one function body instead of each
+    having a copy of the same few lines.
+    """
+
+    def measure(self, channel=None, wait=None, install=False):
+        (m, p) = (mode, para)
+        if (newer is not None and self._version > self._versionLegacy):
+            if (not newer):
+                # This measurement does not exist for newer sw versions
+                return self.OverRange
+            (m, p) = newer
+        if (p and '{chan}' in p):
+            # need channel as parameter so grab self.channel if channel is None
+            p = p.format(chan=self.channelStr(self.channel if channel is None else channel))
+        return self._measure(m, para=p, channel=channel, wait=wait, install=install)
+
+    measure.__name__ = name
+    measure.__qualname__ = 'Keysight.' + name
+    measure.__doc__ = doc + _MEASURE_DOC_TAIL
+    return measure
+
+class MeasureHandle(object):
+    """Measurement made inside a Keysight.batch() block
+
+    Its value is read from the oscilloscope when the block ends. Use
+    result() to get it after that.
+    """
+
+    __slots__ = ('_value', '_done')
+
+    def __init__(self):
+        self._value = None
+        self._done = False
+
+    def done(self):
+        """Return True if the value has been read"""
+        return self._done
+
+    def result(self):
+        """Return the value of the measurement"""
+        if (not self._done):
+            raise RuntimeError('Measurement is only read at the end of the batch() block')
+        return self._value
+
+    def _setResult(self, value):
+        self._value = value
+        self._done = True
+
+
 class Keysight(Oscilloscope):
     """Child class of Oscilloscope for controlling and accessing a HP/Agilent/Keysight Oscilloscope with PyVISA and SCPI commands"""
 
@@ -57,21 +142,34 @@ class Keysight(Oscilloscope):
         wait       - float that gives the default number of seconds to wait after sending each command
         """
         # NOTE: maxChannel is accessible in this package via parent as: self._max_chan
+        #
+        # NOTE: Keysight oscilloscopes end every response with '\n', so
+        # let VISA end each read on it and strip it instead of reading
+        # until END and then stripping it here.
         super(Keysight, self).__init__(resource, maxChannel, wait,
                                        cmd_prefix=':',
-                                       read_strip='\n',
-                                       read_termination='',
+                                       read_strip='',
+                                       read_termination='\n',
                                        write_termination='\n'
         )
 
         # Return list of valid analog channel strings. These are numbers.
         self._chanAnaValidList = [str(x) for x in range(1,self._max_chan+1)]
 
+        # channelStr() of each valid analog channel string, so it
+        # does not have to be formatted for every command
+        self._chanStrTbl = {x: self.channelStr(x) for x in self._chanAnaValidList}
+
         # list of ALL valid channel strings.
         #
         # NOTE: Currently, only valid common values are a
         # CHAN+numerical string for the analog channels
-        self._chanAllValidList = [self.channelStr(x) for x in range(1,self._max_chan+1)]
+        self._chanAllValidList = [self._chanStrTbl[x] for x in self._chanAnaValidList]
+
+        # Sets of the above for fast checks of channel values. Child
+        # classes that add to the lists must rebuild these.
+        self._chanAnaValidSet = frozenset(self._chanAnaValidList)
+        self._chanAllValidSet = frozenset(self._chanAllValidList)
 
         # Give the Series a name
         self._series = 'KEYSIGHT'
@@ -93,6 +191,176 @@ class Keysight(Oscilloscope):
         self._annotationText = ''
         self._annotationColor = 'ch1' # default to Channel 1 color
 
+        # Set to False if the transport or instrument cannot handle
+        # compound SCPI messages (commands joined with ';'). If False,
+        # _instWriteBatch() sends each command as a separate write.
+        self._transportSupportsBatching = True
+
+        # Last known DVM and MEASure sources. These save a query round
+        # trip for each reading. Set to None when unknown so the next
+        # reading asks the oscilloscope.
+        self._dvmSourceCache = None
+        self._measSourceCache = None
+
+        # When a list, _measure() adds the query of each measurement to
+        # it instead of sending the query (see batch())
+        self._measPending = None
+
+        # Recent measurement values, as (value, monotonic() time)
+        # keyed by (mode, para, channel). If _measCacheTTL is above 0, a
+        # value is reused instead of queried again if it is younger
+        # than _measCacheTTL seconds. Any command other than a MEASure
+        # command clears it.
+        self._measCache = {}
+        self._measCacheTTL = 0
+
+        # How a measurement makes sure setting changes are done before
+        # it is read when no wait time is given: 'opc' puts a *OPC? and
+        # 'wai' a *WAI in front of the measurement query, in the same
+        # message, while 'sleep' does not wait at all.
+        self._measSyncMode = 'opc'
+
+        # True once install has turned on the statistics display, so
+        # that it is not turned on again for every installed measurement
+        self._measStatsOn = False
+
+        # Held while an async method uses the oscilloscope from an
+        # executor thread so that its commands do not get mixed up
+        # with those of another async method
+        self._asyncLock = Lock()
+        self._asyncLoopLock = None
+
+        # Number of DVM:CURRent? queries to send in each compound
+        # query while waiting for a valid DVM reading
+        self._dvmPollCount = 3
+
+        # True if annotations are made with bookmarks, which is the
+        # case for firmware newer than self._versionLegacy. Set by
+        # open() once the firmware version is known.
+        self._useBookmarkAnnot = False
+
+    def _normalizeChannel(self, channel, allowList, name):
+        """Make channel the current channel, if it is not None, and return
+        the current channel as a list
+
+        channel   - channel string, list of channel strings or None to keep the current channel
+
+        allowList - if False, raise ValueError if the channel is a list
+
+        name      - name of the operation to use in the error message
+        """
+
+        if channel is not None:
+            self.channel = channel
+
+        if (isinstance(self.channel, list)):
+            if (not allowList):
+                raise ValueError('Channel cannot be a list for {}!'.format(name))
+            return self.channel
+
+        return [self.channel]
+
+    def _clearSourceCache(self):
+        """Forget the cached DVM and MEASure sources and statistics state so they get queried or set again"""
+        self._dvmSourceCache = None
+        self._measSourceCache = None
+        self._measStatsOn = False
+        self.invalidateMeasCache()
+
+    def invalidateMeasCache(self):
+        """Forget recent measurement values so the next measurements
+        are read from the oscilloscope
+
+        Call this after changing oscilloscope settings outside of this
+        class, like from the front panel, if a measurement must not
+        return a value read before the change.
+        """
+        self._measCache.clear()
+
+    def open(self):
+        """Open a connection to the VISA device"""
+        self._clearSourceCache()
+        super(Keysight, self).open()
+
+        # The firmware version does not change while connected
+        self._useBookmarkAnnot = (self._version > self._versionLegacy)
+
+    def close(self):
+        """Close the VISA connection"""
+        self._clearSourceCache()
+        super(Keysight, self).close()
+
+    def reset(self):
+        """Sends a *RST message to reset to defaults"""
+        self._clearSourceCache()
+        return super(Keysight, self).reset()
+
+    def setupLoad(self, filename):
+        """ Restore the oscilloscope setup from file with given filename. """
+        self._clearSourceCache()
+        return super(Keysight, self).setupLoad(filename)
+
+    def autoscale(self):
+        """ Autoscale Oscilloscope"""
+        self._clearSourceCache()
+        super(Keysight, self).autoscale()
+
+    def _instWrite(self, writeStr, checkErrors=True):
+        # A command other than a MEASure command may change what the
+        # measurements read, so forget any recent values
+        if (self._measCache and
+            any([not cmd.lstrip(':').startswith(('MEAS', '*WAI')) for cmd in writeStr.split(';')])):
+            self.invalidateMeasCache()
+        return super(Keysight, self)._instWrite(writeStr, checkErrors)
+
+    def _instWriteBatch(self, cmds, checkErrors=True):
+        """Send a list of SCPI commands as a single compound message
+
+        cmds - list of command strings, each formatted as for _instWrite()
+
+        Each additional command gets the command prefix so it starts
+        again from the root of the command tree. This saves a round
+        trip for every command beyond the first one.
+        """
+
+        if (not self._transportSupportsBatching):
+            for cmd in cmds:
+                self._instWrite(cmd, checkErrors)
+            return
+
+        # Only the first command gets its prefix from _instWrite()
+        writeStr = cmds[0] + ''.join(
+            [';' + (cmd if cmd[0] == '*' else self._prefix + cmd) for cmd in cmds[1:]])
+        return self._instWrite(writeStr, checkErrors)
+
+    def _instQueryBatch(self, queries, checkErrors=True):
+        """Send a list of SCPI queries as a single compound message and
+        return a list with the response to each one
+
+        queries - list of query strings, each formatted as for _instQuery()
+
+        Commands without a '?' may be mixed in with the queries. They
+        have no response so the returned list only has one entry for
+        each query.
+
+        The oscilloscope separates the responses with ';'. This does
+        not work if a response itself can contain a ';', like a quoted
+        string.
+        """
+
+        if (not self._transportSupportsBatching):
+            replies = []
+            for query in queries:
+                if ('?' in query):
+                    replies.append(self._instQuery(query, checkErrors))
+                else:
+                    self._instWrite(query, checkErrors)
+            return replies
+
+        # Only the first query gets its prefix from _instQuery()
+        queryStr = queries[0] + ''.join(
+            [';' + (query if query[0] == '*' else self._prefix + query) for query in queries[1:]])
+        return self._instQuery(queryStr, checkErrors).split(';')
 
     def modeRun(self):
         """ Set Oscilloscope to RUN Mode """
@@ -112,7 +380,6 @@ class Keysight(Oscilloscope):
         sleep(0.1)
         self._instWrite('SINGLE')
 
-        
     def annotate(self, text, color=None, background='TRAN'):
         """ Add an annotation with text, color and background to screen
 
@@ -131,16 +398,24 @@ class Keysight(Oscilloscope):
         # case of color is None.
         self.annotateColor(color)
         
-        if (self._version <= self._versionLegacy):
+        if (not self._useBookmarkAnnot):
             # Legacy commands for annotations
             #
             # Add an annotation to the screen
-            self._instWrite("DISPlay:ANN:BACKground {}".format(background))   # transparent background - can also be OPAQue or INVerted
-            self._instWrite('DISPlay:ANN:TEXT "{}"'.format(text))
-            self._instWrite("DISPlay:ANN ON")
+            self._instWriteBatch([
+                "DISPlay:ANN:BACKground {}".format(background),   # transparent background - can also be OPAQue or INVerted
+                f'DISPlay:ANN:TEXT "{text.translate(self._SCPI_STR_ESC)}"',
+                "DISPlay:ANN ON"])
             
-    ## Use to convert legacy color names
-    _colorNameOldtoNew = {
+    ## Translation table to escape text sent inside a quoted SCPI
+    ## string, where a '"' must be doubled.
+    ##
+    ## NOTE: backslashes are left alone so that \n (two characters) in
+    ## annotation text still gives a newline on the screen.
+    _SCPI_STR_ESC = str.maketrans({'"': '""'})
+
+    ## Use to convert legacy color names (read-only and shared by all instances)
+    _colorNameOldtoNew = MappingProxyType({
         'ch1':    'CHAN1',
         'ch2':    'CHAN2',
         'ch3':    'CHAN3',
@@ -155,7 +430,10 @@ class Keysight(Oscilloscope):
         'marker': 'MARK',
         'white':  'FUNC14',         # closest match
         'red':    'FUNC12'          # no good match
-    }
+    })
+
+    ## Look up a new color name with a default for names not in the table
+    _resolveColor = staticmethod(_colorNameOldtoNew.get)
             
     def annotateColor(self, color):
         """ Change screen annotation color """
@@ -167,23 +445,24 @@ class Keysight(Oscilloscope):
         #
         # If > self._versionLegacy, will translate color names
         
-        if (self._version > self._versionLegacy):
+        if (self._useBookmarkAnnot):
             if (color is not None):
                 # save color
                 self._annotationColor = color
 
-            # Place Bookmark in top left of grid
-            self._instWrite("DISPlay:BOOKmark1:XPOSition 0.015")
-            self._instWrite("DISPlay:BOOKmark1:YPOSition 0.06")
-
             #@@@#print("Current Location of Bookmark 1: {},{}".format(
             #@@@#    self._instQuery("DISPlay:BOOKmark1:XPOSition?"), self._instQuery("DISPlay:BOOKmark1:YPOSition?")))
             
-            # Always use the first Bookmark to implement similar annotation to 3000 series
-            self._instWrite('DISPlay:BOOKmark1:SET NONE,\"{}\",{},\"{}\"'.format(
-                self._annotationText,
-                self._colorNameOldtoNew[self._annotationColor],
-                self._annotationText))
+            # Place Bookmark in top left of grid and always use the
+            # first Bookmark to implement similar annotation to 3000
+            # series
+            text = self._annotationText.translate(self._SCPI_STR_ESC)
+            # Pass along names that are not legacy names as is
+            color = self._resolveColor(self._annotationColor, self._annotationColor)
+            self._instWriteBatch([
+                "DISPlay:BOOKmark1:XPOSition 0.015",
+                "DISPlay:BOOKmark1:YPOSition 0.06",
+                f'DISPlay:BOOKmark1:SET NONE,"{text}",{color},"{text}"'])
             
         elif (color is not None):
             # If legacy and color is None, ignore
@@ -192,7 +471,7 @@ class Keysight(Oscilloscope):
     def annotateOff(self):
         """ Turn off screen annotation """
 
-        if (self._version > self._versionLegacy):
+        if (self._useBookmarkAnnot):
             self._instWrite("DISPlay:BOOKmark1:DELete")
         else:
             self._instWrite("DISPlay:ANN OFF")
@@ -205,19 +484,14 @@ class Keysight(Oscilloscope):
         """
 
         # If a channel value is passed in, make it the
-        # current channel
-        if channel is not None and type(channel) is not list:
-            self.channel = channel
-
-        # Make sure channel is NOT a list
-        if type(self.channel) is list or type(channel) is list:
-            raise ValueError('Channel cannot be a list for CHANNEL LABEL!')
+        # current channel. Make sure channel is NOT a list.
+        self._normalizeChannel(channel, False, 'CHANNEL LABEL')
 
         # Check channel value
-        if (self.channel not in self._chanAnaValidList):
+        if (self.channel not in self._chanAnaValidSet):
             raise ValueError('INVALID Channel Value for CHANNEL LABEL: {}  SKIPPING!'.format(self.channel))
             
-        self._instWrite('CHAN{}:LABel "{}"'.format(self.channel, label))
+        self._instWrite(f'CHAN{self.channel}:LABel "{label.translate(self._SCPI_STR_ESC)}"')
         self._instWrite('DISPlay:LABel ON')
 
     def channelLabelOff(self):
@@ -232,25 +506,23 @@ class Keysight(Oscilloscope):
         # If a channel value is passed in, make it the
         # current channel and process the list, viewing only these channels
         if channel is not None:
-            self.channel = channel
-
             # Make channel a list even if it is a single value
-            if type(self.channel) is not list:
-                chanlist = [self.channel]
-            else:
-                chanlist = self.channel
+            chanlist = self._normalizeChannel(channel, True, 'AUTOSCALE')
 
             # Turn off all channels
             self.outputOffAll()
             
-            # Turn on selected channels
-            chanstr = ''
+            # Turn on selected channels with a single compound command
+            views = []
             for chan in chanlist:                        
                 # Check channel value
-                if (chan not in self._chanAllValidList):
+                if (chan not in self._chanAllValidSet):
                     print('INVALID Channel Value for AUTOSCALE: {}  SKIPPING!'.format(chan))
                 else:
-                    self._instWrite("VIEW {}".format(chan))
+                    views.append("VIEW {}".format(chan))
+
+            if (views):
+                self._instWriteBatch(views)
                     
         # Make sure Autoscale is only autoscaling displayed channels
         #@@@#self._instWrite("AUToscale:CHANnels DISPlayed")
@@ -770,16 +1042,11 @@ class Keysight(Oscilloscope):
         """
         
         # If a channel value is passed in, make it the
-        # current channel
-        if channel is not None and type(channel) is not list:
-            self.channel = channel
-
-        # Make sure channel is NOT a list
-        if type(self.channel) is list or type(channel) is list:
-            raise ValueError('Channel cannot be a list for WAVEFORM!')
+        # current channel. Make sure channel is NOT a list.
+        self._normalizeChannel(channel, False, 'WAVEFORM')
 
         # Check channel value
-        if (self.channel not in self.chanAllValidList):
+        if (self.channel not in self._chanAllValidSet):
             raise ValueError('INVALID Channel Value for WAVEFORM: {}  SKIPPING!'.format(self.channel))            
 
         
@@ -791,8 +1058,14 @@ class Keysight(Oscilloscope):
         return (x, y, header, meta)
         
 
-    def _measureStatistics(self):
+    def _measureStatistics(self, cols=7):
         """Returns data from the current statistics window.
+
+        Returns a tuple of a list with the label of each measurement
+        and a 2D numpy array with the other cols-1 values of each
+        measurement in its rows.
+
+        cols - number of values returned for each measurement, including the label
         """
 
         # tell Results? return all values (as opposed to just one of them)
@@ -801,11 +1074,21 @@ class Keysight(Oscilloscope):
         # create a list of the return values, which are seperated by a comma
         statFlat = self._instQuery("MEASure:RESults?").split(',')
 
-        # Return flat, uninterpreted data returned from command
-        return statFlat
+        if ((len(statFlat) % cols != 0)):
+            print('Unexpected response. Oscilloscope may not have any measurements enabled.')
+            return ([], np.empty((0, cols-1)))
+
+        # convert the flat list into a two-dimentional matrix with
+        # cols columns per row and let numpy convert all of the
+        # numbers at once
+        statMat = np.array(statFlat).reshape(-1, cols)
+        return (statMat[:,0].tolist(), statMat[:,1:].astype(np.float64))
     
 
-    def _readDVM(self, mode, channel=None, timeout=None, wait=0.5):
+    ## Command strings to select each DVM mode used by _readDVM()
+    _DVM_MODE_CMDS = {mode: "DVM:MODE " + mode for mode in ('ACRM', 'DC', 'DCRM', 'FREQ')}
+
+    def _readDVM(self, mode, channel=None, timeout=None, wait=None):
         """Read the DVM data of desired channel and return the value.
 
         channel: channel, as a string, to set to DVM mode and return its
@@ -814,8 +1097,9 @@ class Keysight(Oscilloscope):
         timeout: if None, no timeout, otherwise, time-out in seconds
         waiting for a valid number
 
-        wait: Number of seconds after select DVM mode before trying to
-        read values. Set to None for no waiting (not recommended)
+        wait: if None, use *OPC? to wait for the DVM mode selection to
+        complete before trying to read values, otherwise number of
+        seconds to wait after selecting DVM mode
         """
 
         if (self.series == 'KEYSIGHT' or self.series == 'UXR'):
@@ -827,16 +1111,11 @@ class Keysight(Oscilloscope):
             return self.OverRange
         
         # If a channel value is passed in, make it the
-        # current channel
-        if channel is not None and type(channel) is not list:
-            self.channel = channel
-
-        # Make sure channel is NOT a list
-        if type(self.channel) is list or type(channel) is list:
-            raise ValueError('Channel cannot be a list for DVM!')
+        # current channel. Make sure channel is NOT a list.
+        self._normalizeChannel(channel, False, 'DVM')
 
         # Check channel value
-        if (self.channel not in self._chanAnaValidList):
+        if (self.channel not in self._chanAnaValidSet):
             raise ValueError('INVALID Channel Value for DVM: {}  SKIPPING!'.format(self.channel))
             
         # First check if DVM is enabled
@@ -850,36 +1129,63 @@ class Keysight(Oscilloscope):
         # moving average since do not know if buffers are cleared when
         # the SOURCE command is sent even if the channel does not
         # change.
-        src = self._instQuery("DVM:SOURce?")
-        #print("Source: {}".format(src))
-        if (self._chanNumber(src) != self.channel):
+        #
+        # The source is only queried if it is not already known from
+        # an earlier reading.
+        if (self._dvmSourceCache is None):
+            src = self._instQuery("DVM:SOURce?")
+            #print("Source: {}".format(src))
+            self._dvmSourceCache = str(self._chanNumber(src))
+        if (self._dvmSourceCache != self.channel):
             # Different channel value so switch it
             #print("Switching to {}".format(self.channel))
-            self._instWrite("DVM:SOURce {}".format(self.channelStr(self.channel)))
+            self._instWrite("DVM:SOURce {}".format(self._chanStrTbl[self.channel]))
+            self._dvmSourceCache = self.channel
 
         # Select the desired DVM mode
-        self._instWrite("DVM:MODE {}".format(mode))
+        self._instWrite(self._DVM_MODE_CMDS.get(mode) or "DVM:MODE " + mode)
 
-        # wait a little before read value to make sure everything is switched
-        if (wait):
+        # make sure everything is switched before read value, either
+        # by asking the oscilloscope or by waiting a little
+        if (wait is None):
+            self._instQuery("*OPC?")
+        elif (wait):
             sleep(wait)
 
         # Read value until get one < +9.9E+37 (per programming guide suggestion)
-        startTime = datetime.now()
+        #
+        # Several readings are requested with each compound query so
+        # that every round trip has more than one chance at a valid
+        # value. If mode is frequency, the frequency is requested at
+        # the end of the same query so it does not need its own round
+        # trip.
+        polls = ["DVM:CURRent?"] * self._dvmPollCount
+        if (mode == "FREQ"):
+            polls.append("DVM:FREQ?")
+        freq = None
+        deadline = (monotonic() + timeout) if timeout is not None else None
         val = self.OverRange
         while (val >= self.OverRange):
-            duration = datetime.now() - startTime
-            if (timeout is not None and duration.total_seconds() >= timeout):
+            if (deadline is not None and monotonic() >= deadline):
                 # if timeout is a value and have been waiting that
                 # many seconds for a valid DVM value, stop waiting and
                 # return this self.OverRange number.
                 break
 
-            val = self._instQueryNumber("DVM:CURRent?")
+            readings = list(map(self._measureValue, self._instQueryBatch(polls)))
+            if (mode == "FREQ"):
+                freq = readings.pop()
 
-        # if mode is frequency, read and return the 5-digit frequency instead
+            for val in readings:
+                if (val < self.OverRange):
+                    break
+
+        # if mode is frequency, return the 5-digit frequency instead
         if (mode == "FREQ"):
-            val = self._instQueryNumber("DVM:FREQ?")
+            if (freq is None):
+                # Timed out before any readings so read it now
+                freq = self._instQueryNumber("DVM:FREQ?")
+            val = freq
 
         return val
 
@@ -890,8 +1196,8 @@ class Keysight(Oscilloscope):
             # Generic Keysight and UXR do not support DVM
             raise RuntimeError(f"This machine appears to be of the {self.series} series which does not support DVM")
 
-        en = self._instQuery("DVM:ENABle?")
-        return self._1OR0(en)
+        # Only check first character, same as _1OR0()
+        return self._instQuery("DVM:ENABle?")[:1] == '1'
 
     def enableDVM(self, enable=True):
         """Enable or Disable DVM
@@ -907,9 +1213,11 @@ class Keysight(Oscilloscope):
             self._instWrite("DVM:ENABLE ON")
         else:
             self._instWrite("DVM:ENABLE OFF")
+            # Do not trust the cached DVM source once DVM is off
+            self._dvmSourceCache = None
 
         
-    def measureDVMacrms(self, channel=None, timeout=None, wait=0.5):
+    def measureDVMacrms(self, channel=None, timeout=None, wait=None):
         """Measure and return the AC RMS reading of channel using DVM
         mode.
 
@@ -925,7 +1233,7 @@ class Keysight(Oscilloscope):
 
         return self._readDVM("ACRM", channel, timeout, wait)
 
-    def measureDVMdc(self, channel=None, timeout=None, wait=0.5):
+    def measureDVMdc(self, channel=None, timeout=None, wait=None):
         """ Measure and return the DC reading of channel using DVM mode.
 
         DC is defined as 'the DC value of the acquired data.'
@@ -939,7 +1247,7 @@ class Keysight(Oscilloscope):
 
         return self._readDVM("DC", channel, timeout, wait)
 
-    def measureDVMdcrms(self, channel=None, timeout=None, wait=0.5):
+    def measureDVMdcrms(self, channel=None, timeout=None, wait=None):
         """ Measure and return the DC RMS reading of channel using DVM mode.
 
         DC RMS is defined as 'the root-mean-square value of the acquired data.'
@@ -953,7 +1261,7 @@ class Keysight(Oscilloscope):
 
         return self._readDVM("DCRM", channel, timeout, wait)
 
-    def measureDVMfreq(self, channel=None, timeout=3, wait=0.5):
+    def measureDVMfreq(self, channel=None, timeout=3, wait=None):
         """ Measure and return the FREQ reading of channel using DVM mode.
 
         FREQ is defined as 'the frequency counter measurement.'
@@ -970,7 +1278,36 @@ class Keysight(Oscilloscope):
 
         return self._readDVM("FREQ", channel, timeout, wait)
 
-    def _measure(self, mode, para=None, channel=None, wait=0.25, install=False):
+    ## Command and query strings for each measurement mode used by
+    ## _measure(), built once instead of for every measurement
+    _MEAS_CMDS = {mode: ("MEASure:" + mode, "MEASure:" + mode + "?") for mode in (
+        'BRATe', 'BWIDth', 'CDRRate', 'COUNter', 'DUTYcycle', 'FALLtime',
+        'FREQ', 'NDUTy', 'NEDGes', 'NPULses', 'NWIDth', 'OVERshoot',
+        'PEDGes', 'PERiod', 'PPULses', 'PREShoot', 'PWIDth', 'RISetime',
+        'VAMPlitude', 'VAVerage', 'VBASe', 'VMAX', 'VMIN', 'VPP', 'VRMS', 'VTOP')}
+
+    def _measure(self, mode, para=None, channel=None, wait=None, install=False, syncMode=None):
+        """Read and return a measurement of type mode from channel
+
+        Same as _measureOnce() but, if the connection to the
+        oscilloscope was lost, reconnects and tries once more.
+        """
+
+        try:
+            return self._measureOnce(mode, para, channel, wait, install, syncMode)
+        except visa.VisaIOError as err:
+            if (err.error_code not in self._CONNECTION_ERRORS):
+                raise
+            self._reconnectMeasure()
+            return self._measureOnce(mode, para, channel, wait, install, syncMode)
+
+    def _reconnectMeasure(self):
+        """Reconnect after a lost connection and forget anything that
+        was known about the measurement settings"""
+        self._reconnect()
+        self._clearSourceCache()
+
+    def _measureOnce(self, mode, para=None, channel=None, wait=None, install=False, syncMode=None):
         """Read and return a measurement of type mode from channel
 
            mode - selected measurement as a string
@@ -979,66 +1316,461 @@ class Keysight(Oscilloscope):
 
            channel - channel to be measured starting at 1. Must be a string, ie. '1'
 
-           wait - if not None, number of seconds to wait before querying measurement
+           wait - if None, use *OPC? to wait for any setting changes to complete before
+                  querying measurement, otherwise number of seconds to wait
 
            install - if True, adds measurement to the statistics display
+
+           syncMode - 'opc', 'wai' or 'sleep' (see _measureBatch())
         """
 
-        # If a channel value is passed in, make it the
-        # current channel
-        if channel is not None and type(channel) is not list:
-            self.channel = channel
+        self._measureChannel(channel)
+
+        if (self._measPending is not None and not install):
+            # In a batch() block, so only read the value at its end
+            handle = MeasureHandle()
+            self._measPending.append((mode, para, self.channel, False, handle))
+            return handle
+
+        changed = False
+        if (install):
+            # If desire to install the measurement, make sure the
+            # statistics display is on and then use the command form of
+            # the measurement to install the measurement. All of it is
+            # sent as one message, after any source switch.
+            cmds = self._measureSourceCmds()
+            if (not self._measStatsOn):
+                if (self._version > self._versionLegacy):
+                    cmds.append("MEASure:STATistics ON")
+                else:
+                    cmds.append("MEASure:STATistics:DISPlay ON")
+            strWr = self._MEAS_CMDS.get(mode, ("MEASure:" + mode,))[0]
+            if (para):
+                strWr = strWr + " " + para
+            cmds.append(strWr)
+            self._measureWrite(cmds)
+            self._measStatsOn = True
+            changed = True
+        elif (wait):
+            # Switch the source now so that the wait comes after it
+            cmds = self._measureSourceCmds()
+            if (cmds):
+                self._measureWrite(cmds)
+                changed = True
+        else:
+            # Otherwise _measureBatch() switches the source in the same
+            # message as the query, if needed, but it has to be known
+            self._measureSourceKnown()
+
+        if (self._measPending is not None):
+            # Installed it now but read the value at the end of batch()
+            handle = MeasureHandle()
+            self._measPending.append((mode, para, self.channel, changed, handle))
+            return handle
 
-        # Make sure channel is NOT a list
-        if type(self.channel) is list or type(channel) is list:
-            raise ValueError('Channel cannot be a list for MEASURE!')
+        return self._measureBatch([(mode, para, self.channel)], wait, changed, syncMode)[0]
+
+    def _measureChannel(self, channel):
+        """Make channel the current channel and check that it can be measured"""
+
+        # If a channel value is passed in, make it the
+        # current channel. Make sure channel is NOT a list.
+        self._normalizeChannel(channel, False, 'MEASURE')
 
         # Check channel value
-        if (self.channel not in self._chanAnaValidList):
+        if (self.channel not in self._chanAnaValidSet):
             raise ValueError('INVALID Channel Value for MEASURE: {}  SKIPPING!'.format(self.channel))
-            
-        # Next check if desired channel is the source, if not switch it
+
+    def _measureSourceKnown(self):
+        """Make sure that the measurement source is known"""
+
+        # NOTE: the source is only switched if it is not already the
+        # desired channel so as to not possibly break the moving
+        # average since do not know if buffers are cleared when the
+        # SOURCE command is sent even if the channel does not change.
         #
-        # NOTE: doing it this way so as to not possibly break the
-        # moving average since do not know if buffers are cleared when
-        # the SOURCE command is sent even if the channel does not
-        # change.
-        src = self._instQuery("MEASure:SOURce?")
-        #print("Source: {}".format(src))
-        if (self._chanNumber(src) != self.channel):
+        # The source is only queried if it is not already known from
+        # an earlier measurement.
+        if (self._measSourceCache is None):
+            src = self._instQuery("MEASure:SOURce?")
+            #print("Source: {}".format(src))
+            self._measSourceCache = str(self._chanNumber(src))
+
+    def _measureSourceCmds(self):
+        """Return a list with the command that makes the current channel
+        the measurement source, which is empty if it already is. The
+        caller must send it with _measureWrite().
+        """
+
+        self._measureSourceKnown()
+        if (self._measSourceCache != self.channel):
             # Different channel so switch it
             #print("Switching to {}".format(self.channel))
-            self._instWrite("MEASure:SOURce {}".format(self.channelStr(self.channel)))
+            return ["MEASure:SOURce {}".format(self._chanStrTbl[self.channel])]
 
+        return []
+
+    def _measureWrite(self, cmds):
+        """Send cmds, which may start with the command from
+        _measureSourceCmds(), as one message and remember the new
+        measurement source once it has been sent"""
+
+        switch = cmds[0].startswith("MEASure:SOURce ")
+        if (switch):
+            # Source is unknown if the write fails
+            self._measSourceCache = None
+        self._instWriteBatch(cmds)
+        if (switch):
+            self._measSourceCache = self.channel
+
+    def _measureQuery(self, mode, para=None):
+        """Return the query string for measurement mode with parameters para"""
+
+        strQu = self._MEAS_CMDS.get(mode, (None, "MEASure:" + mode + "?"))[1]
         if (para):
-            # Need to add parameters to the write and query strings
-            strWr = "MEASure:{} {}".format(mode, para)
-            strQu = "MEASure:{}? {}".format(mode, para)
-        else:
-            strWr = "MEASure:{}".format(mode)
-            strQu = "MEASure:{}?".format(mode)
+            strQu = strQu + " " + para
+        return strQu
 
-        if (install):
-            # If desire to install the measurement, make sure the
-            # statistics display is on and then use the command form of
-            # the measurement to install the measurement.
-            if (self._version > self._versionLegacy):
-                self._instWrite("MEASure:STATistics ON")
-            else:
-                self._instWrite("MEASure:STATistics:DISPlay ON")
-            self._instWrite(strWr)
+    def _measureValue(self, reply):
+        """Return the value of a measurement reply as a float"""
 
-        # wait a little before read value, if wait is not None
-        if (wait):
-            sleep(wait)
+        # When nothing could be measured, the reply is 9.9E+37 (some
+        # models send 9.91E+37), which is common enough to not parse
+        if (reply.startswith('9.9') and reply.endswith('E+37')):
+            return self.OverRange
+        return float(reply)
+
+    def _measureBatch(self, specs, wait=None, changed=False, syncMode=None):
+        """Read and return a list with the value of each measurement in
+        specs from the current measurement source with one query
+
+        specs - list of (mode, para) tuples, like [('VPP', None)], or
+                of (mode, para, channel) tuples to read measurements
+                of other channels than the current measurement
+                source. The source is switched, followed by a *WAI,
+                in the same message wherever the channel changes.
+
+        If _measCacheTTL is above 0 and wait is None, values read less
+        than _measCacheTTL seconds ago are not queried again and, if
+        all of them are that recent, nothing is sent.
+
+        wait - if None, wait for any setting changes to complete as
+               given by syncMode, otherwise number of seconds to wait
+
+        changed - True if any settings were changed before this call
+
+        syncMode - how to wait for changed settings: 'opc' sends *OPC?
+                   and 'wai' sends *WAI in the same message as, and
+                   before, the measurement queries. 'sleep' sleeps for
+                   wait seconds, if any. If None, 'sleep' is used when
+                   wait is given, otherwise self._measSyncMode.
+        """
+
+        # Reuse any values that were read less than _measCacheTTL
+        # seconds ago and only query the others. A caller that gives a
+        # wait time or changed settings wants a value read after that,
+        # so never reuse one then.
+        keys = [(spec + (self._measSourceCache,))[:3] for spec in specs]
+        values = [None] * len(keys)
+        useCache = (self._measCacheTTL > 0 and wait is None and not changed)
+        if (useCache):
+            now = monotonic()
+            missing = []
+            for (idx, key) in enumerate(keys):
+                cached = self._measCache.get(key)
+                if (cached is not None and now - cached[1] < self._measCacheTTL):
+                    values[idx] = cached[0]
+                else:
+                    missing.append(idx)
+
+            if (not missing):
+                return values
+        else:
+            missing = list(range(len(keys)))
+
+        queries = []
+        source = self._measSourceCache
+        for idx in missing:
+            (mode, para, chan) = keys[idx]
+            if (chan != source):
+                queries += ["MEASure:SOURce " + self._chanStrTbl[chan], "*WAI"]
+                source = chan
+            queries.append(self._measureQuery(mode, para))
+
+        # If any settings were changed, make sure they are done before
+        # read value, either by asking the oscilloscope or by waiting
+        # a little. Only done once for all of the measurements.
+        if (syncMode is None):
+            syncMode = self._measSyncMode if wait is None else 'sleep'
+        sync = []
+        if (syncMode == 'sleep'):
+            if (wait):
+                sleep(wait)
+        elif (changed):
+            if (syncMode == 'opc'):
+                sync = ["*OPC?"]
+            elif (syncMode == 'wai'):
+                sync = ["*WAI"]
+            else:
+                raise ValueError('INVALID syncMode for MEASURE: {}'.format(syncMode))
 
         # query the measurement (do not have to install to query it)
-        val = self._instQuery(strQu)
+        if (len(queries) == 1 and not sync):
+            vals = [self._measureValue(self._instQuery(queries[0]))]
+        else:
+            if (source != self._measSourceCache):
+                # Source is unknown if the query fails
+                self._measSourceCache = None
+            vals = self._instQueryBatch(sync + queries)
+            if (sync == ["*OPC?"]):
+                # Drop the reply to *OPC?
+                vals = vals[1:]
+            if (len(vals) != len(missing)):
+                # Values no longer line up with the measurements
+                raise ValueError('Unexpected response to measurements: "{}"'.format(';'.join(vals)))
+            # Remember which source was left selected
+            self._measSourceCache = source
+            # Parse all of the values in one pass with float(), which
+            # is faster for a batch than checking each one in
+            # _measureValue(). The no-measurement reply parses to a
+            # value >= self.OverRange, which is then returned as exactly
+            # self.OverRange, the same as for a single query.
+            overRange = self.OverRange
+            vals = [(val if val < overRange else overRange) for val in map(float, vals)]
+
+        for (idx, val) in zip(missing, vals):
+            values[idx] = val
+        if (useCache):
+            now = monotonic()
+            for idx in missing:
+                self._measCache[keys[idx]] = (values[idx], now)
+
+        return values
+
+    def measureAll(self, channel=None, wait=None):
+        """Read every measurement in _measureTbl from channel with a
+        single compound query and return them in a dictionary keyed by
+        measurement label
+
+        channel: channel, as string, to be measured - default channel
+        for future readings
+
+        wait - if None, use *OPC? to wait for any setting changes to complete before
+        querying measurements, otherwise number of seconds to wait
+
+        If a returned value is >= self.OverRange, then no valid value
+        could be measured.
+        """
+
+        # Let each measure*() method set up its measurement, as it does
+        # for a single measurement, but read them all at once.
+        values = {}
+        with self.batch(wait):
+            for (meas, (units, func)) in self._measureTbl.items():
+                values[meas] = func(self, channel)
+
+        # Some measurements are answered without a query
+        return {meas: (val.result() if isinstance(val, MeasureHandle) else val)
+                for (meas, val) in values.items()}
+
+    @contextmanager
+    def batch(self, wait=None):
+        """Context manager that makes measurements within it be read
+        with one compound query when it ends
+
+        wait - if None, use *OPC? to wait for any setting changes to complete before
+        querying measurements, otherwise number of seconds to wait
+
+        Inside the block, each measure*() method returns a
+        MeasureHandle, instead of the value, whose result() is the value
+        once the block has ended:
+
+        with scope.batch():
+            vpp = scope.measureVoltPP('1')
+            freq = scope.measureFrequency('2')
+        print(vpp.result(), freq.result())
+
+        Each different measurement is only read once. Nothing is read
+        if the block raises an exception.
+        """
+
+        outer = self._measPending
+        self._measPending = []
+        try:
+            yield
+            pending = self._measPending
+        finally:
+            # A batch() within a batch() reads its own measurements
+            self._measPending = outer
+
+        # Query each different measurement only once
+        specs = list(dict.fromkeys(item[:3] for item in pending))
+        if (specs):
+            changed = any(item[3] for item in pending)
+            try:
+                vals = self._measureBatch(specs, wait, changed)
+            except visa.VisaIOError as err:
+                if (err.error_code not in self._CONNECTION_ERRORS):
+                    raise
+                # Reconnect and try once more, which also switches to
+                # the sources again since they are then unknown
+                self._reconnectMeasure()
+                vals = self._measureBatch(specs, wait, changed)
+            vals = dict(zip(specs, vals))
+            for item in pending:
+                item[4]._setResult(vals[item[:3]])
+
+    def _runLocked(self, func, *args):
+        """Call func(*args) while holding _asyncLock and return its result"""
+        with self._asyncLock:
+            return func(*args)
+
+    @staticmethod
+    def _runningLoop():
+        """Return the event loop of the calling coroutine"""
+        if (version_info >= (3, 7)):
+            return asyncio.get_running_loop()
+        # Python 3.6 has no get_running_loop()
+        return asyncio.get_event_loop()
+
+    def _loopLock(self, loop):
+        """Return the asyncio.Lock that async methods of this object hold
+        while using the oscilloscope from event loop loop
+
+        Only one event loop at a time can use the async methods of an
+        object. A new loop, like from a later asyncio.run(), gets a new
+        lock once the old loop no longer holds its lock. Until then,
+        RuntimeError is raised.
+        """
+
+        # An asyncio.Lock is tied to the loop it is first used in
+        if (self._asyncLoopLock is None or self._asyncLoopLock[0] is not loop):
+            if (self._asyncLoopLock is not None and self._asyncLoopLock[1].locked()):
+                raise RuntimeError('Async methods of this oscilloscope are in use from another event loop')
+            self._asyncLoopLock = (loop, asyncio.Lock())
+        return self._asyncLoopLock[1]
+
+    def _measureSourceSet(self, channel):
+        """Make channel the current channel and the measurement source"""
+
+        self._measureChannel(channel)
+        cmds = self._measureSourceCmds()
+        if (cmds):
+            self._measureWrite(cmds)
+
+    async def _runAsync(self, func, channel, wait, *args):
+        """Coroutine that calls func(*args) in an executor thread and
+        returns its result, first switching to channel and letting wait
+        seconds pass if wait is given"""
+
+        loop = self._runningLoop()
+        async with self._loopLock(loop):
+            if (wait):
+                # Values read before the wait are not wanted
+                self.invalidateMeasCache()
+
+                # Switch the source and then, instead of sleeping in the
+                # executor thread, let the event loop run other tasks
+                # until wait seconds after the switch was started
+                deadline = monotonic() + wait
+                await loop.run_in_executor(None, self._runLocked, self._measureSourceSet, channel)
+                remaining = deadline - monotonic()
+                if (remaining > 0):
+                    await asyncio.sleep(remaining)
+            return await loop.run_in_executor(None, self._runLocked, func, *args)
+
+    async def measureAsync(self, meas, channel=None, wait=None):
+        """Coroutine that does measureTblCall(meas, channel) in an
+        executor thread and returns its value
+
+        wait - if None, use *OPC? to wait for any setting changes to complete before
+        querying measurement, otherwise number of seconds to wait, during
+        which the event loop runs other tasks
+
+        PyVISA only has blocking calls, so this lets the event loop run
+        other tasks, like measurements of other oscilloscopes, while
+        waiting for this one. Measurements of the same oscilloscope
+        from several tasks are done one at a time since they share
+        the measurement source.
+
+        Do not call the blocking methods of this object from other
+        threads while any of its coroutines are running, and only use
+        its coroutines from one event loop at a time.
+        """
+
+        return await self._runAsync(self.measureTblCall, channel, wait, meas, channel)
+
+    async def measureAllChannels(self, channels=None, wait=None):
+        """Coroutine that does measureAll() for each channel in an
+        executor thread and returns a dictionary of their results keyed
+        by channel
+
+        channels - list of channels, as strings, to be measured, or
+                   None for all analog channels
+
+        wait - if None, use *OPC? to wait for any setting changes to complete before
+        querying measurements, otherwise number of seconds to wait after
+        switching to each channel, during which the event loop runs
+        other tasks
+
+        Like measureAsync(), this overlaps with other tasks on the event
+        loop, like measureAllChannels() for other oscilloscopes. The
+        channels themselves are measured one after the other, each with
+        one compound query, since the oscilloscope has only one
+        measurement source. Which channel is left as the default
+        channel is not defined.
+        """
+
+        if (channels is None):
+            channels = self._chanAnaValidList
+
+        results = await asyncio.gather(
+            *[self._runAsync(self.measureAll, chan, wait, chan) for chan in channels])
+        return dict(zip(channels, results))
+
+    def measureBatch(self, channels, mode, para=None, wait=None):
+        """Read and return the measurement of type mode from several
+        channels with a single compound query
+
+        channels - list of channels to be measured, as strings, ie. ['1','2']
+
+        mode - selected measurement as a string, like 'VPP'
+
+        para - parameters to be passed to the query, which must not
+               include the source channel
+
+        wait - if not None, number of seconds to wait before querying
+
+        Returns a list with the measurement of each channel. Unlike
+        the measure*() methods, the current channel is not changed.
+        Wherever the channel changes, the source is switched, followed
+        by a *WAI, in the same compound query.
+
+        To measure with several oscilloscopes at once, call this (or
+        any other measurement) for each oscilloscope object from its
+        own thread, for example with
+        concurrent.futures.ThreadPoolExecutor. PyVISA releases the GIL
+        while waiting for the instrument.
+        """
 
-        return float(val)
+        if (not channels):
+            return []
 
+        # Check channel values
+        for chan in channels:
+            if (chan not in self._chanAnaValidSet):
+                raise ValueError('INVALID Channel Value for MEASURE: {}  SKIPPING!'.format(chan))
 
-    def measureBitRate(self, channel=None, wait=0.25, install=False):
+        specs = [(mode, para, chan) for chan in channels]
+        try:
+            return self._measureBatch(specs, wait)
+        except visa.VisaIOError as err:
+            if (err.error_code not in self._CONNECTION_ERRORS):
+                raise
+            self._reconnectMeasure()
+            return self._measureBatch(specs, wait)
+
+    def measureBitRate(self, channel=None, wait=None, install=False):
         """Measure and return the bit rate measurement.
 
         This measurement is defined as: 'measures all positive and
@@ -1052,7 +1784,8 @@ class Keysight(Oscilloscope):
         channel: channel, as string, to be measured - default channel
         for future readings
 
-        wait - if not None, number of seconds to wait before querying measurement
+        wait - if None, use *OPC? to wait for any setting changes to complete before
+        querying measurement, otherwise number of seconds to wait
 
         install - if True, adds measurement to the statistics display
 
@@ -1066,36 +1799,15 @@ class Keysight(Oscilloscope):
         else:
             return self._measure("BRATe", channel=channel, wait=wait, install=install)
 
-    def measureBurstWidth(self, channel=None, wait=0.25, install=False):
-        """Measure and return the burst width measurement.
+    # With newer firmware, BWIDth changed - now it is burst width within
+    # waveform, not just Screen edges - and must set an idle time - not
+    # sure what to set - setting 1 us for now
+    measureBurstWidth = _measureMethod("measureBurstWidth", "BWIDth", newer=("BWIDth", "{chan},1e-6"), doc="""Measure and return the burst width measurement.
 
         This measurement is defined as: 'the width of the burst on the
-        screen.'
-
-        If the returned value is >= self.OverRange, then no valid value
-        could be measured.
-
-        channel: channel, as string, to be measured - default channel
-        for future readings
+        screen.'""")
 
-        wait - if not None, number of seconds to wait before querying measurement
-
-        install - if True, adds measurement to the statistics display
-        """
-
-        
-        if (self._version > self._versionLegacy):
-            # BWIDth changed - now it is burst width within waveform, not just Screen edges
-            # must set an idle time - not sure what to set - setting 1 us for now
-            if channel is None:
-                # need channel as parameter so grab self.channel if channel is None
-                channel = self.channel
-            return self._measure("BWIDth", para="{},{}".format(self.channelStr(channel),'1e-6'),
-                                 channel=channel, wait=wait, install=install)
-        else:
-            return self._measure("BWIDth", channel=channel, wait=wait, install=install)
-
-    def measureCounterFrequency(self, channel=None, wait=0.25, install=False):
+    def measureCounterFrequency(self, channel=None, wait=None, install=False):
         """Measure and return the counter frequency
 
         This measurement is defined as: 'the counter frequency.'
@@ -1106,7 +1818,8 @@ class Keysight(Oscilloscope):
         channel: channel, as string, to be measured - default channel
         for future readings
 
-        wait - if not None, number of seconds to wait before querying measurement
+        wait - if None, use *OPC? to wait for any setting changes to complete before
+        querying measurement, otherwise number of seconds to wait
 
         install - issues if install, so this paramter is ignored
         """
@@ -1122,8 +1835,8 @@ class Keysight(Oscilloscope):
         else:
             return self._measure("COUNter", channel=channel, wait=wait, install=False)
 
-    def measurePosDutyCycle(self, channel=None, wait=0.25, install=False):
-        """Measure and return the positive duty cycle
+    # With newer firmware, must specify if Positive (Rising Edge to Rising Edge)
+    measurePosDutyCycle = _measureMethod("measurePosDutyCycle", "DUTYcycle", newer=("DUTYcycle", "{chan},RISing"), doc="""Measure and return the positive duty cycle
 
         This measurement is defined as: 'The value returned for the duty
         cycle is the ratio of the positive pulse width to the
@@ -1131,31 +1844,9 @@ class Keysight(Oscilloscope):
         signal are measured, then the duty cycle is calculated with the
         following formula:
 
-        duty cycle = (+pulse width/period)*100'
-
-        If the returned value is >= self.OverRange, then no valid value
-        could be measured.
-
-        channel: channel, as string, to be measured - default channel
-        for future readings
-
-        wait - if not None, number of seconds to wait before querying measurement
-
-        install - if True, adds measurement to the statistics display
-        """
-
-        if (self._version > self._versionLegacy):
-            # Must specify if Positive (Rising Edge to Rising Edge)
-            if channel is None:
-                # need channel as parameter so grab self.channel if channel is None
-                channel = self.channel
-            return self._measure("DUTYcycle", para="{},{}".format(self.channelStr(channel),'RISing'),
-                                 channel=channel, wait=wait, install=install)
-        else:
-            return self._measure("DUTYcycle", channel=channel, wait=wait, install=install)
+        duty cycle = (+pulse width/period)*100'""")
 
-    def measureFallTime(self, channel=None, wait=0.25, install=False):
-        """Measure and return the fall time
+    measureFallTime = _measureMethod("measureFallTime", "FALLtime", doc="""Measure and return the fall time
 
         This measurement is defined as: 'the fall time of the displayed
         falling (negative-going) edge closest to the trigger
@@ -1164,23 +1855,9 @@ class Keysight(Oscilloscope):
         at the lower threshold of the falling edge, and calculating the
         fall time with the following formula:
 
-        fall time = time at lower threshold - time at upper threshold'
-
-        If the returned value is >= self.OverRange, then no valid value
-        could be measured.
-
-        channel: channel, as string, to be measured - default channel
-        for future readings
-
-        wait - if not None, number of seconds to wait before querying measurement
-
-        install - if True, adds measurement to the statistics display
-        """
+        fall time = time at lower threshold - time at upper threshold'""")
 
-        return self._measure("FALLtime", channel=channel, wait=wait, install=install)
-
-    def measureRiseTime(self, channel=None, wait=0.25, install=False):
-        """Measure and return the rise time
+    measureRiseTime = _measureMethod("measureRiseTime", "RISetime", doc="""Measure and return the rise time
 
         This measurement is defined as: 'the rise time of the displayed
         rising (positive-going) edge closest to the trigger
@@ -1191,42 +1868,15 @@ class Keysight(Oscilloscope):
         the time at the upper threshold of the rising edge, then
         calculating the rise time with the following formula:
 
-        rise time = time at upper threshold - time at lower threshold'
+        rise time = time at upper threshold - time at lower threshold'""")
 
-        If the returned value is >= self.OverRange, then no valid value
-        could be measured.
-
-        channel: channel, as string, to be measured - default channel
-        for future readings
-
-        wait - if not None, number of seconds to wait before querying measurement
-
-        install - if True, adds measurement to the statistics display
-        """
-
-        return self._measure("RISetime", channel=channel, wait=wait, install=install)
-
-    def measureFrequency(self, channel=None, wait=0.25, install=False):
-        """Measure and return the frequency of cycle on screen
+    measureFrequency = _measureMethod("measureFrequency", "FREQ", doc="""Measure and return the frequency of cycle on screen
 
         This measurement is defined as: 'the frequency of the cycle on
-        the screen closest to the trigger reference.'
-
-        If the returned value is >= self.OverRange, then no valid value
-        could be measured.
-
-        channel: channel, as string, to be measured - default channel
-        for future readings
-
-        wait - if not None, number of seconds to wait before querying measurement
-
-        install - if True, adds measurement to the statistics display
-        """
-
-        return self._measure("FREQ", channel=channel, wait=wait, install=install)
+        the screen closest to the trigger reference.'""")
 
-    def measureNegDutyCycle(self, channel=None, wait=0.25, install=False):
-        """Measure and return the negative duty cycle
+    # With newer firmware, must specify if Negative (Falling Edge to Falling Edge)
+    measureNegDutyCycle = _measureMethod("measureNegDutyCycle", "NDUTy", newer=("DUTYcycle", "{chan},FALLing"), doc="""Measure and return the negative duty cycle
 
         This measurement is defined as: 'The value returned for the duty
         cycle is the ratio of the negative pulse width to the
@@ -1234,73 +1884,19 @@ class Keysight(Oscilloscope):
         signal are measured, then the duty cycle is calculated with the
         following formula:
 
-        -duty cycle = (-pulse width/period)*100'
+        -duty cycle = (-pulse width/period)*100'""")
 
-        If the returned value is >= self.OverRange, then no valid value
-        could be measured.
-
-        channel: channel, as string, to be measured - default channel
-        for future readings
-
-        wait - if not None, number of seconds to wait before querying measurement
-
-        install - if True, adds measurement to the statistics display
-        """
-
-        if (self._version > self._versionLegacy):
-            # Must specify if Negative (Falling Edge to Falling Edge)
-            if channel is None:
-                # need channel as parameter so grab self.channel if channel is None
-                channel = self.channel
-            return self._measure("DUTYcycle", para="{},{}".format(self.channelStr(channel),'FALLing'),
-                                 channel=channel, wait=wait, install=install)
-        else:
-            return self._measure("NDUTy", channel=channel, wait=wait, install=install)
-
-    def measureFallEdgeCount(self, channel=None, wait=0.25, install=False):
-        """Measure and return the on-screen falling edge count
+    measureFallEdgeCount = _measureMethod("measureFallEdgeCount", "NEDGes", newer=(), doc="""Measure and return the on-screen falling edge count
 
         This measurement is defined as: 'the on-screen falling edge
-        count'
-
-        If the returned value is >= self.OverRange, then no valid value
-        could be measured.
-
-        channel: channel, as string, to be measured - default channel
-        for future readings
-
-        wait - if not None, number of seconds to wait before querying measurement
+        count'""")
 
-        install - if True, adds measurement to the statistics display
-        """
-
-        if (self._version > self._versionLegacy):
-            # This measurement does not exist for newer sw versions
-            return self.OverRange
-        else:
-            return self._measure("NEDGes", channel=channel, wait=wait, install=install)
-
-    def measureFallPulseCount(self, channel=None, wait=0.25, install=False):
-        """Measure and return the on-screen falling pulse count
+    measureFallPulseCount = _measureMethod("measureFallPulseCount", "NPULses", doc="""Measure and return the on-screen falling pulse count
 
         This measurement is defined as: 'the on-screen falling pulse
-        count'
-
-        If the returned value is >= self.OverRange, then no valid value
-        could be measured.
-
-        channel: channel, as string, to be measured - default channel
-        for future readings
+        count'""")
 
-        wait - if not None, number of seconds to wait before querying measurement
-
-        install - if True, adds measurement to the statistics display
-        """
-
-        return self._measure("NPULses", channel=channel, wait=wait, install=install)
-
-    def measureNegPulseWidth(self, channel=None, wait=0.25, install=False):
-        """Measure and return the on-screen falling/negative pulse width
+    measureNegPulseWidth = _measureMethod("measureNegPulseWidth", "NWIDth", doc="""Measure and return the on-screen falling/negative pulse width
 
         This measurement is defined as: 'the width of the negative pulse
         on the screen closest to the trigger reference using the
@@ -1308,23 +1904,9 @@ class Keysight(Oscilloscope):
 
         FOR the negative pulse closest to the trigger point:
 
-        width = (time at trailing rising edge - time at leading falling edge)'
-
-        If the returned value is >= self.OverRange, then no valid value
-        could be measured.
-
-        channel: channel, as string, to be measured - default channel
-        for future readings
-
-        wait - if not None, number of seconds to wait before querying measurement
-
-        install - if True, adds measurement to the statistics display
-        """
+        width = (time at trailing rising edge - time at leading falling edge)'""")
 
-        return self._measure("NWIDth", channel=channel, wait=wait, install=install)
-
-    def measureOvershoot(self, channel=None, wait=0.25, install=False):
-        """Measure and return the on-screen voltage overshoot in percent
+    measureOvershoot = _measureMethod("measureOvershoot", "OVERshoot", doc="""Measure and return the on-screen voltage overshoot in percent
 
         This measurement is defined as: 'the overshoot of the edge
         closest to the trigger reference, displayed on the screen. The
@@ -1347,23 +1929,9 @@ class Keysight(Oscilloscope):
         instead of the normal one, because it is conceivable that a
         signal may have more preshoot than overshoot, and the normal
         extremum would then be dominated by the preshoot of the
-        following edge.'
-
-        If the returned value is >= self.OverRange, then no valid value
-        could be measured.
-
-        channel: channel, as string, to be measured - default channel
-        for future readings
-
-        wait - if not None, number of seconds to wait before querying measurement
-
-        install - if True, adds measurement to the statistics display
-        """
-
-        return self._measure("OVERshoot", channel=channel, wait=wait, install=install)
+        following edge.'""")
 
-    def measurePreshoot(self, channel=None, wait=0.25, install=False):
-        """Measure and return the on-screen voltage preshoot in percent
+    measurePreshoot = _measureMethod("measurePreshoot", "PREShoot", doc="""Measure and return the on-screen voltage preshoot in percent
 
         This measurement is defined as: 'the preshoot of the edge
         closest to the trigger, displayed on the screen. The method used
@@ -1386,65 +1954,19 @@ class Keysight(Oscilloscope):
         used instead of the normal one, because it is likely that a
         signal may have more overshoot than preshoot, and the normal
         extremum would then be dominated by the overshoot of the
-        preceding edge.'
+        preceding edge.'""")
 
-        If the returned value is >= self.OverRange, then no valid value
-        could be measured.
-
-        channel: channel, as string, to be measured - default channel
-        for future readings
-
-        wait - if not None, number of seconds to wait before querying measurement
-
-        install - if True, adds measurement to the statistics display
-        """
-
-        return self._measure("PREShoot", channel=channel, wait=wait, install=install)
-
-    def measureRiseEdgeCount(self, channel=None, wait=0.25, install=False):
-        """Measure and return the on-screen rising edge count
+    measureRiseEdgeCount = _measureMethod("measureRiseEdgeCount", "PEDGes", newer=(), doc="""Measure and return the on-screen rising edge count
 
         This measurement is defined as: 'the on-screen rising edge
-        count'
-
-        If the returned value is >= self.OverRange, then no valid value
-        could be measured.
-
-        channel: channel, as string, to be measured - default channel
-        for future readings
-
-        wait - if not None, number of seconds to wait before querying measurement
-
-        install - if True, adds measurement to the statistics display
-        """
+        count'""")
 
-        if (self._version > self._versionLegacy):
-            # This measurement does not exist for newer sw versions
-            return self.OverRange
-        else:
-            return self._measure("PEDGes", channel=channel, wait=wait, install=install)
-
-    def measureRisePulseCount(self, channel=None, wait=0.25, install=False):
-        """Measure and return the on-screen rising pulse count
+    measureRisePulseCount = _measureMethod("measureRisePulseCount", "PPULses", doc="""Measure and return the on-screen rising pulse count
 
         This measurement is defined as: 'the on-screen rising pulse
-        count'
+        count'""")
 
-        If the returned value is >= self.OverRange, then no valid value
-        could be measured.
-
-        channel: channel, as string, to be measured - default channel
-        for future readings
-
-        wait - if not None, number of seconds to wait before querying measurement
-
-        install - if True, adds measurement to the statistics display
-        """
-
-        return self._measure("PPULses", channel=channel, wait=wait, install=install)
-
-    def measurePosPulseWidth(self, channel=None, wait=0.25, install=False):
-        """Measure and return the on-screen falling/positive pulse width
+    measurePosPulseWidth = _measureMethod("measurePosPulseWidth", "PWIDth", doc="""Measure and return the on-screen falling/positive pulse width
 
         This measurement is defined as: 'the width of the displayed
         positive pulse closest to the trigger reference. Pulse width is
@@ -1454,23 +1976,9 @@ class Keysight(Oscilloscope):
 
         THEN width = (time at trailing falling edge - time at leading rising edge)
 
-        ELSE width = (time at leading falling edge - time at leading rising edge)'
-
-        If the returned value is >= self.OverRange, then no valid value
-        could be measured.
-
-        channel: channel, as string, to be measured - default channel
-        for future readings
-
-        wait - if not None, number of seconds to wait before querying measurement
-
-        install - if True, adds measurement to the statistics display
-        """
-
-        return self._measure("PWIDth", channel=channel, wait=wait, install=install)
+        ELSE width = (time at leading falling edge - time at leading rising edge)'""")
 
-    def measurePeriod(self, channel=None, wait=0.25, install=False):
-        """Measure and return the on-screen period
+    measurePeriod = _measureMethod("measurePeriod", "PERiod", doc="""Measure and return the on-screen period
 
         This measurement is defined as: 'the period of the cycle closest
         to the trigger reference on the screen. The period is measured
@@ -1480,167 +1988,55 @@ class Keysight(Oscilloscope):
 
         THEN period = (time at trailing rising edge - time at leading rising edge)
 
-        ELSE period = (time at trailing falling edge - time at leading falling edge)'
-
-        If the returned value is >= self.OverRange, then no valid value
-        could be measured.
-
-        channel: channel, as string, to be measured - default channel
-        for future readings
+        ELSE period = (time at trailing falling edge - time at leading falling edge)'""")
 
-        wait - if not None, number of seconds to wait before querying measurement
-
-        install - if True, adds measurement to the statistics display
-        """
-
-        return self._measure("PERiod", channel=channel, wait=wait, install=install)
-
-    def measureVoltAmplitude(self, channel=None, wait=0.25, install=False):
-        """Measure and return the vertical amplitude of the signal
+    measureVoltAmplitude = _measureMethod("measureVoltAmplitude", "VAMPlitude", doc="""Measure and return the vertical amplitude of the signal
 
         This measurement is defined as: 'the vertical amplitude of the
         waveform. To determine the amplitude, the instrument measures
         Vtop and Vbase, then calculates the amplitude as follows:
 
-        vertical amplitude = Vtop - Vbase'
-
-        If the returned value is >= self.OverRange, then no valid value
-        could be measured.
-
-        channel: channel, as string, to be measured - default channel
-        for future readings
-
-        wait - if not None, number of seconds to wait before querying measurement
-
-        install - if True, adds measurement to the statistics display
-        """
+        vertical amplitude = Vtop - Vbase'""")
 
-        return self._measure("VAMPlitude", channel=channel, wait=wait, install=install)
-
-    def measureVoltAverage(self, channel=None, wait=0.25, install=False):
-        """Measure and return the Average Voltage measurement.
+    measureVoltAverage = _measureMethod("measureVoltAverage", "VAVerage", para="DISPlay", doc="""Measure and return the Average Voltage measurement.
 
         This measurement is defined as: 'average value of an integral
         number of periods of the signal. If at least three edges are not
-        present, the oscilloscope averages all data points.'
-
-        If the returned value is >= self.OverRange, then no valid value
-        could be measured.
-
-        channel: channel, as string, to be measured - default channel
-        for future readings
-
-        wait - if not None, number of seconds to wait before querying measurement
-
-        install - if True, adds measurement to the statistics display
-        """
-
-        return self._measure("VAVerage", para="DISPlay", channel=channel, wait=wait, install=install)
+        present, the oscilloscope averages all data points.'""")
 
-    def measureVoltRMS(self, channel=None, wait=0.25, install=False):
-        """Measure and return the DC RMS Voltage measurement.
+    measureVoltRMS = _measureMethod("measureVoltRMS", "VRMS", para="DISPlay,DC", doc="""Measure and return the DC RMS Voltage measurement.
 
         This measurement is defined as: 'the dc RMS value of the
         selected waveform. The dc RMS value is measured on an integral
         number of periods of the displayed signal. If at least three
         edges are not present, the oscilloscope computes the RMS value
-        on all displayed data points.'
+        on all displayed data points.'""")
 
-        If the returned value is >= self.OverRange, then no valid value
-        could be measured.
-
-        channel: channel, as string, to be measured - default channel
-        for future readings
-
-        wait - if not None, number of seconds to wait before querying measurement
-
-        install - if True, adds measurement to the statistics display
-        """
-
-        return self._measure("VRMS", para="DISPlay,DC", channel=channel, wait=wait, install=install)
-
-    def measureVoltBase(self, channel=None, wait=0.25, install=False):
-        """Measure and return the Voltage base measurement.
+    measureVoltBase = _measureMethod("measureVoltBase", "VBASe", doc="""Measure and return the Voltage base measurement.
 
         This measurement is defined as: 'the vertical value at the base
         of the waveform. The base value of a pulse is normally not the
-        same as the minimum value.'
-
-        If the returned value is >= self.OverRange, then no valid value
-        could be measured.
-
-        channel: channel, as string, to be measured - default channel
-        for future readings
-
-        wait - if not None, number of seconds to wait before querying measurement
-
-        install - if True, adds measurement to the statistics display
-        """
-
-        return self._measure("VBASe", channel=channel, wait=wait, install=install)
+        same as the minimum value.'""")
 
-    def measureVoltTop(self, channel=None, wait=0.25, install=False):
-        """Measure and return the Voltage Top measurement.
+    measureVoltTop = _measureMethod("measureVoltTop", "VTOP", doc="""Measure and return the Voltage Top measurement.
 
         This measurement is defined as: 'the vertical value at the top
         of the waveform. The top value of the pulse is normally not the
-        same as the maximum value.'
+        same as the maximum value.'""")
 
-        If the returned value is >= self.OverRange, then no valid value
-        could be measured.
-
-        channel: channel, as string, to be measured - default channel
-        for future readings
-
-        wait - if not None, number of seconds to wait before querying measurement
-
-        install - if True, adds measurement to the statistics display
-        """
-
-        return self._measure("VTOP", channel=channel, wait=wait, install=install)
-
-    def measureVoltMax(self, channel=None, wait=0.25, install=False):
-        """Measure and return the Maximum Voltage measurement.
+    measureVoltMax = _measureMethod("measureVoltMax", "VMAX", doc="""Measure and return the Maximum Voltage measurement.
 
         This measurement is defined as: 'the maximum vertical value
-        present on the selected waveform.'
-
-        If the returned value is >= self.OverRange, then no valid value
-        could be measured.
-
-        channel: channel, as string, to be measured - default channel
-        for future readings
-
-        wait - if not None, number of seconds to wait before querying measurement
-
-        install - if True, adds measurement to the statistics display
-        """
-
-        return self._measure("VMAX", channel=channel, wait=wait, install=install)
+        present on the selected waveform.'""")
 
 
-    def measureVoltMin(self, channel=None, wait=0.25, install=False):
-        """Measure and return the Minimum Voltage measurement.
+    measureVoltMin = _measureMethod("measureVoltMin", "VMIN", doc="""Measure and return the Minimum Voltage measurement.
 
         This measurement is defined as: 'the minimum vertical value
-        present on the selected waveform.'
-
-        If the returned value is >= self.OverRange, then no valid value
-        could be measured.
-
-        channel: channel, as string, to be measured - default channel
-        for future readings
-
-        wait - if not None, number of seconds to wait before querying measurement
-
-        install - if True, adds measurement to the statistics display
-        """
+        present on the selected waveform.'""")
 
-        return self._measure("VMIN", channel=channel, wait=wait, install=install)
 
-
-    def measureVoltPP(self, channel=None, wait=0.25, install=False):
-        """Measure and return the voltage peak-to-peak measurement.
+    measureVoltPP = _measureMethod("measureVoltPP", "VPP", doc="""Measure and return the voltage peak-to-peak measurement.
 
         This measurement is defined as: 'the maximum and minimum
         vertical value for the selected source, then calculates the
@@ -1651,51 +2047,39 @@ class Keysight(Oscilloscope):
         Vpp = Vmax - Vmin
 
         Vmax and Vmin are the vertical maximum and minimum values
-        present on the selected source.'
-
-        If the returned value is >= self.OverRange, then no valid value
-        could be measured.
-
-        channel: channel, as string, to be measured - default channel
-        for future readings
-
-        wait - if not None, number of seconds to wait before querying measurement
-
-        install - if True, adds measurement to the statistics display
-        """
-
-        return self._measure("VPP", channel=channel, wait=wait, install=install)
-
-    ## This is a dictionary of measurement labels with their units and
-    ## method to get the data from the scope.
-    _measureTbl = {
-        'Bit Rate': ['Hz', measureBitRate],
-        'Burst Width': ['s', measureBurstWidth],
-        'Counter Freq': ['Hz', measureCounterFrequency],
-        'Frequency': ['Hz', measureFrequency],
-        'Period': ['s', measurePeriod],
-        'Duty': ['%', measurePosDutyCycle],
-        'Neg Duty': ['%', measureNegDutyCycle],
-        'Fall Time': ['s', measureFallTime],
-        'Rise Time': ['s', measureRiseTime],
-        'Num Falling': ['', measureFallEdgeCount],
-        'Num Neg Pulses': ['', measureFallPulseCount],
-        'Num Rising': ['', measureRiseEdgeCount],
-        'Num Pos Pulses': ['', measureRisePulseCount],
-        '- Width': ['s', measureNegPulseWidth],
-        '+ Width': ['s', measurePosPulseWidth],
-        'Overshoot': ['%', measureOvershoot],
-        'Preshoot': ['%', measurePreshoot],
-        'Amplitude': ['V', measureVoltAmplitude],
-        'Top': ['V', measureVoltTop],
-        'Base': ['V', measureVoltBase],
-        'Maximum': ['V', measureVoltMax],
-        'Minimum': ['V', measureVoltMin],
-        'Pk-Pk': ['V', measureVoltPP],
-        'V p-p': ['V', measureVoltPP],
-        'Average - Full Screen': ['V', measureVoltAverage],
-        'RMS - Full Screen': ['V', measureVoltRMS],
-        }
+        present on the selected source.'""")
+
+    ## This is a read-only dictionary of measurement labels with their
+    ## units and method to get the data from the scope. It is shared by
+    ## all instances.
+    _measureTbl = MappingProxyType({
+        'Bit Rate': ('Hz', measureBitRate),
+        'Burst Width': ('s', measureBurstWidth),
+        'Counter Freq': ('Hz', measureCounterFrequency),
+        'Frequency': ('Hz', measureFrequency),
+        'Period': ('s', measurePeriod),
+        'Duty': ('%', measurePosDutyCycle),
+        'Neg Duty': ('%', measureNegDutyCycle),
+        'Fall Time': ('s', measureFallTime),
+        'Rise Time': ('s', measureRiseTime),
+        'Num Falling': ('', measureFallEdgeCount),
+        'Num Neg Pulses': ('', measureFallPulseCount),
+        'Num Rising': ('', measureRiseEdgeCount),
+        'Num Pos Pulses': ('', measureRisePulseCount),
+        '- Width': ('s', measureNegPulseWidth),
+        '+ Width': ('s', measurePosPulseWidth),
+        'Overshoot': ('%', measureOvershoot),
+        'Preshoot': ('%', measurePreshoot),
+        'Amplitude': ('V', measureVoltAmplitude),
+        'Top': ('V', measureVoltTop),
+        'Base': ('V', measureVoltBase),
+        'Maximum': ('V', measureVoltMax),
+        'Minimum': ('V', measureVoltMin),
+        'Pk-Pk': ('V', measureVoltPP),
+        'V p-p': ('V', measureVoltPP),
+        'Average - Full Screen': ('V', measureVoltAverage),
+        'RMS - Full Screen': ('V', measureVoltRMS),
+        })
 
     def measureTblUnits(self, meas):
         """Return units for measurement 'meas'
@@ -46,6 +46,8 @@ except Exception:
     from scpi import SCPI
 
 from quantiphy import Quantity
+from functools import partial
+from types import MappingProxyType
 import numpy as np
 import csv
 
@@ -86,8 +88,18 @@ class Oscilloscope(SCPI):
         # digital channels 8-15
         self._chanAllValidList = self._chanAnaValidList + [str(x) for x in ['POD1','POD2']]
 
+        # Sets of the above for fast checks of channel values. Child
+        # classes that add to the lists must rebuild these.
+        self._chanAnaValidSet = frozenset(self._chanAnaValidList)
+        self._chanAllValidSet = frozenset(self._chanAllValidList)
+
         # Give the Series a name
         self._series = 'GENERIC'
+
+        # Quantity() factories with the units of each measurement
+        # already bound so polish() can skip looking them up
+        self._polishFactory = {meas: partial(Quantity, units=val[0])
+                               for (meas, val) in self._measureTbl.items()}
         
     @property
     def chanAnaValidList(self):
@@ -333,8 +345,9 @@ class Oscilloscope(SCPI):
         # Save waveform data values to CSV file.
         # Determine iterator
         if (isinstance(y[0],list)):
-            # Multiple columns in y, so break them out
-            it = [[a,*b] for (a,b) in zip(x,y)]
+            # Multiple columns in y, so break them out. Build each row
+            # as it is written instead of a copy of all rows first.
+            it = ((a,*b) for (a,b) in zip(x,y))
         else:
             # Simply single column of y data
             it = zip(x,y)
@@ -397,10 +410,10 @@ class Oscilloscope(SCPI):
         return nLength
 
     
-    ## This is a dictionary of measurement labels with their units. It
-    ## is blank here and it is expected that this get defined by child
-    ## classes.
-    _measureTbl = { }
+    ## This is a read-only dictionary of measurement labels with their
+    ## units. It is blank here and it is expected that this get defined
+    ## by child classes.
+    _measureTbl = MappingProxyType({ })
     
 
     def polish(self, value, measure=None):
@@ -415,11 +428,8 @@ class Oscilloscope(SCPI):
         if (value >= self.OverRange):
             pol = '------'
         else:
-            try:
-                pol = Quantity(value, self._measureTbl[measure][0])
-            except KeyError:
-                # If measure is None or does not exist
-                pol = Quantity(value)
+            # If measure is None or does not exist, use no units
+            pol = self._polishFactory.get(measure, Quantity)(value)
 
         return pol
 
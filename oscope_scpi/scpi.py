@@ -37,6 +37,7 @@ from __future__ import division
 from __future__ import print_function
 
 from time import sleep
+from time import perf_counter
 from sys import version_info
 from sys import exit
 import pyvisa as visa
@@ -47,6 +48,11 @@ class SCPI(object):
     OverRange = +9.9E+37                  # Number which indicates Over Range
     UnderRange = -9.9E+37                 # Number which indicates Under Range
     ErrorQueue = 30                       # Size of error queue
+
+    ## VISA errors that mean the connection to the instrument is gone
+    ## and a new session is needed
+    _CONNECTION_ERRORS = (visa.constants.StatusCode.error_connection_lost,
+                          visa.constants.StatusCode.error_io)
     
     def __init__(self, resource, max_chan=1, wait=0,
                      cmd_prefix = '',
@@ -73,6 +79,7 @@ class SCPI(object):
         self._read_termination = read_termination
         self._write_termination = write_termination
         self._timeout = timeout
+        self._chunk_size = 1024 * 1024   # VISA read size, large enough for most replies in a single read
         self._IDNmanu = ''      # store manufacturer from IDN here
         self._IDNmodel = ''     # store instrument model number from IDN here
         self._IDNserial = ''    # store instrument serial number from IDN here
@@ -80,14 +87,31 @@ class SCPI(object):
         self._versionLegacy = 0.0   # set software version which triggers Legacy code to lowest value until it gets set
         self._legacyError = True    # Start off using Legacy Error method since both old and new instruments return something
         self._inst = None
+        self._profile = None        # dictionary of command latencies when profiling is enabled
 
     def open(self):
         """Open a connection to the VISA device with PYVISA-py python library"""
         self._rm = visa.ResourceManager('@py')
+        self._openSession()
+
+        # Read ID to gather items like software version number so can
+        # deviate operation based on changes to commands over history
+        # (WHY did they make changes?)  MUST be done before below
+        # clear() which sends first command.
+        self._getID()
+
+        # Also, send a *CLS system command to clear the command
+        # handler (error queues and such)
+        self.clear()
+
+    def _openSession(self):
+        """Open the VISA session to the instrument, which is then kept
+        open and used for all commands until close()"""
         self._inst = self._rm.open_resource(self._resource,
                                             read_termination=self._read_termination,
                                             write_termination=self._write_termination)
         self._inst.timeout = self._timeout
+        self._inst.chunk_size = self._chunk_size
 
         # Keysight recommends using clear()
         #
@@ -103,16 +127,16 @@ class SCPI(object):
             else:
                 # However, if this is a different error be sure to raise it.
                 raise
-                
-        # Read ID to gather items like software version number so can
-        # deviate operation based on changes to commands over history
-        # (WHY did they make changes?)  MUST be done before below
-        # clear() which sends first command.
-        self._getID()
 
-        # Also, send a *CLS system command to clear the command
-        # handler (error queues and such)
-        self.clear()
+    def _reconnect(self):
+        """Replace a VISA session whose connection was lost with a new one"""
+
+        try:
+            self._inst.close()
+        except visa.Error:
+            # Likely already broken so ignore any error closing it
+            pass
+        self._openSession()
 
         
     def close(self):
@@ -132,7 +156,7 @@ class SCPI(object):
             queryStr = self._prefix + queryStr
         #print("QUERY:",queryStr)
         try:
-            result = self._inst.query(queryStr)
+            result = self._timed(queryStr, self._inst.query, queryStr)
         except visa.VisaIOError as err:
             # Got VISA exception so read and report any errors
             if checkErrors:
@@ -154,7 +178,7 @@ class SCPI(object):
             writeStr = self._prefix + writeStr
         #@@@print("WRITE:",writeStr)
         try:
-            result = self._inst.write(writeStr)
+            result = self._timed(writeStr, self._inst.write, writeStr)
         except visa.VisaIOError as err:
             # Got VISA exception so read and report any errors
             if checkErrors:
@@ -168,6 +192,97 @@ class SCPI(object):
             self.checkInstErrors(writeStr)
         return result
 
+    def _timed(self, key, func, *args, **kwargs):
+        """Return func(*args, **kwargs), adding the time it took to the
+        profile under command key if profiling is enabled"""
+
+        if (self._profile is None):
+            return func(*args, **kwargs)
+
+        start = perf_counter()
+        result = func(*args, **kwargs)
+        self._profileRecord(key, perf_counter() - start)
+        return result
+
+    def enableProfile(self, enable=True):
+        """Start (or stop) recording how long each command and query
+        takes, which can be read with getProfile() or dumpProfile().
+        Starting again clears any earlier recordings. Binary and
+        number list transfers, like waveforms and hardcopies, are
+        included.
+
+        Commands are grouped by their header, without any parameters,
+        so for example all 'MEASure:SOURce CHANx' commands are one
+        entry. Each message of several commands joined with ';' is
+        its own entry.
+        """
+
+        self._profile = {} if enable else None
+
+    def _profileRecord(self, cmd, seconds):
+        """Add the time in seconds it took to send cmd, and to read its
+        reply if any, to the profile"""
+
+        key = ';'.join([part.split(' ', 1)[0] for part in cmd.split(';')])
+        stats = self._profile.get(key)
+        if (stats is None):
+            # count, total, min, max and a histogram with the number of
+            # times in each power of 2 nanoseconds
+            stats = self._profile[key] = [0, 0.0, seconds, seconds, [0] * 64]
+        stats[0] += 1
+        stats[1] += seconds
+        stats[2] = min(stats[2], seconds)
+        stats[3] = max(stats[3], seconds)
+        stats[4][min(int(seconds * 1e9).bit_length(), 63)] += 1
+
+    @staticmethod
+    def _profilePercentile(hist, count, percent):
+        """Return the upper limit in seconds of the histogram bucket
+        with the sample at percent"""
+
+        target = count * percent / 100.0
+        total = 0
+        for (bucket, num) in enumerate(hist):
+            total += num
+            if (num and total >= target):
+                return (1 << bucket) / 1e9
+        return 0.0
+
+    def getProfile(self):
+        """Return a dictionary, keyed by command, with the recorded
+        'count', 'total', 'min', 'max' and 'mean' time in seconds of
+        each one and a 'hist' histogram of the number of times up to
+        each power of 2 nanoseconds, or None if profiling is not enabled
+        """
+
+        if (self._profile is None):
+            return None
+
+        return {key: {'count': stats[0], 'total': stats[1],
+                      'min': stats[2], 'max': stats[3],
+                      'mean': stats[1] / stats[0],
+                      'hist': {(1 << bucket) / 1e9: num for (bucket, num) in enumerate(stats[4]) if num}}
+                for (key, stats) in self._profile.items()}
+
+    def dumpProfile(self):
+        """Print the recorded times of each command in milliseconds,
+        most total time first. The percentiles are the upper limit of
+        the power of 2 nanoseconds range that they fall in."""
+
+        if (self._profile is None):
+            print('Profiling is not enabled. Use enableProfile() first.')
+            return
+
+        print('{: <40} {:>7} {:>10} {:>10} {:>10} {:>10} {:>10} {:>10}'.format(
+            'Command', 'Count', 'Total', 'Min', 'Mean', 'Max', 'p50', 'p99'))
+        for (key, stats) in sorted(self._profile.items(), key=lambda item: -item[1][1]):
+            (count, total, tmin, tmax, hist) = stats
+            print('{: <40} {:>7} {:>10.3f} {:>10.3f} {:>10.3f} {:>10.3f} {:>10.3f} {:>10.3f}'.format(
+                key if len(key) <= 40 else key[:37] + '...', count, total * 1e3, tmin * 1e3,
+                total / count * 1e3, tmax * 1e3,
+                self._profilePercentile(hist, count, 50) * 1e3,
+                self._profilePercentile(hist, count, 99) * 1e3))
+
     def chStr(self, channel):
         """return the channel string given the channel number and using the format CHx"""
 
@@ -208,10 +323,7 @@ class SCPI(object):
 
         # Only check first character so do not need to deal with
         # trailing whitespace and such
-        if str[:1] == '1':
-            return True
-        else:
-            return False
+        return str[:1] == '1'
 
     def _chanNumber(self, str):
         """Decode the response as a channel number and return it. Return 0 if string does not decode properly.
@@ -321,7 +433,7 @@ class SCPI(object):
             queryStr = self._prefix + queryStr
         #print("QUERYIEEEBlock:",queryStr)
         try:
-            result = self._inst.query_binary_values(queryStr, datatype='s', container=bytes)
+            result = self._timed(queryStr, self._inst.query_binary_values, queryStr, datatype='s', container=bytes)
         except visa.VisaIOError as err:
             # Got VISA exception so read and report any errors
             if checkErrors:
@@ -342,7 +454,7 @@ class SCPI(object):
             queryStr = self._prefix + queryStr
         #print("QUERYNumbers:",queryStr)
         try:
-            result = self._inst.query_ascii_values(queryStr, converter='f', separator=',')
+            result = self._timed(queryStr, self._inst.query_ascii_values, queryStr, converter='f', separator=',')
         except visa.VisaIOError as err:
             # Got VISA exception so read and report any errors
             if checkErrors:
@@ -371,7 +483,7 @@ class SCPI(object):
             datatype = 'B'
 
         try:
-            result = self._inst.write_binary_values(writeStr, values, datatype=datatype)
+            result = self._timed(writeStr, self._inst.write_binary_values, writeStr, values, datatype=datatype)
         except visa.VisaIOError as err:
             # Got VISA exception so read and report any errors
             if checkErrors:
@@ -389,7 +501,7 @@ class SCPI(object):
         #print("WRITE:",writeStr)
 
         try:
-            result = self._inst.write_binary_values(writeStr, values, datatype='f')
+            result = self._timed(writeStr, self._inst.write_binary_values, writeStr, values, datatype='f')
         except visa.VisaIOError as err:
             # Got VISA exception so read and report any errors
             if checkErrors:
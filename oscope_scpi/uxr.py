@@ -69,6 +69,9 @@ class UXR(Keysight):
         
         # Add Wave Memory (document says this is 1-4 but my MXR scope has 8 memory slots)
         self._chanAllValidList += ['WMEM'+str(x) for x in range(1,9)]
+
+        # Rebuild the set of ALL valid channel strings to match the list
+        self._chanAllValidSet = frozenset(self._chanAllValidList)
         
         # Give the Series a name
         self._series = 'UXR'        
@@ -80,26 +83,18 @@ class UXR(Keysight):
         from the code below.
         """
 
-        statFlat = super(UXR, self)._measureStatistics()
+        (labels, values) = super(UXR, self)._measureStatistics()
 
-        # convert the flat list into a two-dimentional matrix with seven columns per row
-        cols = 7
-        if ((len(statFlat) % cols != 0)):
-            print('Unexpected response. Oscilloscope may not have any measurements enabled.')
-            statMat = []
-        else:
-            statMat = [statFlat[i:i+cols] for i in range(0,len(statFlat),cols)]
-        
-        # convert each row into a dictionary, while converting text strings into numbers
+        # convert each row into a dictionary
         stats = []
-        for stat in statMat:
-            stats.append({'label':stat[0],
-                          'CURR':float(stat[1]),     # Current Value
-                          'MIN':float(stat[2]),      # Minimum Value
-                          'MAX':float(stat[3]),      # Maximum Value
-                          'MEAN':float(stat[4]),     # Average/Mean Value
-                          'STDD':float(stat[5]),     # Standard Deviation
-                          'COUN':int(float(stat[6])) # Count of measurements
+        for (label, stat) in zip(labels, values.tolist()):
+            stats.append({'label':label,
+                          'CURR':stat[0],         # Current Value
+                          'MIN':stat[1],          # Minimum Value
+                          'MAX':stat[2],          # Maximum Value
+                          'MEAN':stat[3],         # Average/Mean Value
+                          'STDD':stat[4],         # Standard Deviation
+                          'COUN':int(stat[5])     # Count of measurements
                           })
 
         # return the result in an array of dictionaries
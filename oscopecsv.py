@@ -26,7 +26,8 @@
 # EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 #-------------------------------------------------------------------------------
-#  Convert NPZ waveform output file from oscope.py into CSV file
+#  Convert NPZ waveform output files from oscope.py into CSV (or Parquet or
+#  Feather) files
 #-------------------------------------------------------------------------------
 
 # For future Python3 compatibility:
@@ -36,26 +37,194 @@ from __future__ import print_function
 
 import numpy as np
 import pathlib
+import struct
 import sys
+import zipfile
+import argparse
+from concurrent.futures import ProcessPoolExecutor
 
-filename = sys.argv[1]
-
-header=None
-meta=None
-with np.load(filename) as data:
-    x = data['x']
-    y = data['y']
-    if 'header' in data.files:
-        header = data['header']
-    if 'meta' in data.files:
-        meta = data['meta']
-
-p = pathlib.Path(filename)
-fileout = p.with_suffix('.csv')
-
-if (len(x) == len(y)):
-    a = np.asarray([ x, y ])
-    np.savetxt(fileout, a.T, delimiter=",")
-else:
-    print("ERROR: Number of x ({}) and y ({}) values do not match!".format(len(x),len(y)))
-          
+## Number of rows converted at a time, which limits how much memory is
+## used for long waveforms
+CHUNK = 1 << 20
+
+def npzMemmap(filename, name):
+    """Return array name from NPZ file filename as a read-only memmap,
+    so that it is only read from disk as it is used, or None if that
+    is not possible.
+
+    np.load() ignores mmap_mode for NPZ files. However, oscope.py
+    writes them with np.savez(), which stores each array uncompressed,
+    so the array data can be mapped directly from the zip file.
+    """
+
+    with zipfile.ZipFile(filename) as zf:
+        try:
+            info = zf.getinfo(name + '.npy')
+        except KeyError:
+            return None
+        if (info.compress_type != zipfile.ZIP_STORED):
+            return None
+
+    with open(filename, 'rb') as f:
+        # The data follows the zip local file header, which is 30
+        # bytes plus the file name and extra field
+        f.seek(info.header_offset + 26)
+        (nameLen, extraLen) = struct.unpack('<HH', f.read(4))
+        f.seek(info.header_offset + 30 + nameLen + extraLen)
+
+        version = np.lib.format.read_magic(f)
+        if (version == (1, 0)):
+            (shape, fortran, dtype) = np.lib.format.read_array_header_1_0(f)
+        elif (version == (2, 0)):
+            (shape, fortran, dtype) = np.lib.format.read_array_header_2_0(f)
+        else:
+            return None
+        offset = f.tell()
+
+    if (dtype.hasobject or (fortran and len(shape) > 1)):
+        return None
+
+    return np.memmap(filename, dtype=dtype, mode='r', offset=offset, shape=shape)
+
+
+def convertFile(filename, fmt='csv'):
+    """Same as convert() but, if filename cannot be read or converted,
+    print why, remove any partly written output file and return None
+    so that the other files still get converted.
+    """
+
+    fileout = pathlib.Path(filename).with_suffix('.' + fmt)
+    before = fileStat(fileout)
+    try:
+        return convert(filename, fmt)
+    except (OSError, ValueError, KeyError, zipfile.BadZipFile) as err:
+        print("ERROR: Could not convert {}: {}".format(filename, err))
+        # Only remove the output file if this run wrote to it
+        after = fileStat(fileout)
+        if (after is not None and after != before):
+            try:
+                fileout.unlink()
+            except OSError:
+                pass
+        return None
+
+
+def fileStat(path):
+    """Return the modification time and size of path, or None if it does not exist"""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def convert(filename, fmt='csv'):
+    """Convert NPZ waveform file filename into a file with the same
+    name but the suffix of fmt, which is 'csv', 'parquet' or 'feather'
+
+    Returns the name of the output file, or None if it could not be
+    written because the x and y arrays do not have the same 1-D shape.
+
+    The binary formats need pyarrow, so ImportError is raised for them
+    if it is not installed.
+    """
+
+    if (fmt != 'csv'):
+        # Only needed for the binary formats, which write the x and y
+        # values as they are instead of formatting each one as text
+        import pyarrow as pa
+        import pyarrow.parquet
+        import pyarrow.ipc
+
+    header=None
+    meta=None
+    with np.load(filename) as data:
+        # Map x and y instead of reading them, if possible
+        x = npzMemmap(filename, 'x')
+        if x is None:
+            x = data['x']
+        y = npzMemmap(filename, 'y')
+        if y is None:
+            y = data['y']
+        if 'header' in data.files:
+            header = data['header']
+        if 'meta' in data.files:
+            meta = data['meta']
+
+    p = pathlib.Path(filename)
+    fileout = p.with_suffix('.' + fmt)
+
+    # Compare the whole shape and not only the first axis. Each value
+    # is written as one row, so only single waveforms are supported.
+    if (x.shape != y.shape or x.ndim != 1):
+        print("ERROR: Shapes of x {} and y {} do not match or are not 1-D in {}!".format(x.shape,y.shape,filename))
+        return None
+
+    # Convert CHUNK rows at a time so that only that many are in
+    # memory at once
+    if (fmt == 'csv'):
+        # Fill the two columns directly instead of stacking x and y into
+        # rows and writing a transposed copy. The oscilloscope does not
+        # have more than 9 digits of resolution, so do not write 18.
+        #
+        # Instead of np.savetxt(), which formats row by row, format all
+        # rows of a chunk with a single % operation.
+        #
+        # The columns get the smallest type that holds both x and y, so
+        # float32 waveforms are not copied as float64.
+        rowFmt = "%.9e,%.9e\n"
+        out = np.empty((min(len(x), CHUNK), 2), dtype=np.promote_types(x.dtype, y.dtype))
+
+        # Write the ASCII bytes to a binary file with a large buffer,
+        # skipping the text layer and keeping the number of write calls
+        # to the system small.
+        with open(fileout, 'wb', buffering=1<<20) as f:
+            for i in range(0, len(x), CHUNK):
+                n = min(CHUNK, len(x) - i)
+                out[:n,0] = x[i:i+n]
+                out[:n,1] = y[i:i+n]
+                f.write(((rowFmt * n) % tuple(out[:n].ravel().tolist())).encode('ascii'))
+    else:
+        schema = pa.schema([('x', pa.from_numpy_dtype(x.dtype)), ('y', pa.from_numpy_dtype(y.dtype))])
+        if (fmt == 'parquet'):
+            writer = pa.parquet.ParquetWriter(fileout, schema, compression='zstd')
+        else:
+            # Feather version 2 is the Arrow IPC file format. Use the
+            # same compression as write_feather().
+            writer = pa.ipc.new_file(str(fileout), schema,
+                                     options=pa.ipc.IpcWriteOptions(compression='lz4'))
+        with writer:
+            for i in range(0, len(x), CHUNK):
+                writer.write_table(pa.table({'x': x[i:i+CHUNK], 'y': y[i:i+CHUNK]}, schema=schema))
+
+    return fileout
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Convert NPZ waveform files from oscope.py into CSV, Parquet or Feather files')
+    parser.add_argument('--format', '-f', choices=['csv', 'parquet', 'feather'], default='csv',
+                        help='format of output files, which get the same name as the input files but with this suffix (default: csv)')
+    parser.add_argument('--jobs', '-j', type=int, default=None,
+                        help='number of files to convert in parallel (default: number of CPUs)')
+    parser.add_argument('filenames', nargs='+', metavar='filename', help='NPZ waveform file to convert')
+    args = parser.parse_args()
+
+    if (args.format != 'csv'):
+        try:
+            import pyarrow
+        except ImportError:
+            print('pyarrow is needed for {} output. Please install it with "pip install pyarrow"'.format(args.format))
+            print('or use the default CSV output.\n')
+            sys.exit(-1)
+
+    if (len(args.filenames) == 1 or args.jobs == 1):
+        results = [convertFile(filename, args.format) for filename in args.filenames]
+    else:
+        # Each file is converted in its own process since the
+        # formatting is CPU bound and holds the GIL
+        with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+            results = list(pool.map(convertFile, args.filenames, [args.format] * len(args.filenames)))
+
+    # Let scripts know if any file could not be converted
+    if (None in results):
+        sys.exit(2)